@@ -1,11 +1,18 @@
 # app.py - Flask Backend für Bautagebuch
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, abort, g, render_template, request, jsonify, send_file, send_from_directory, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime, date
+from flask_compress import Compress
+from sqlalchemy import delete, event, select, update
+from sqlalchemy.orm import joinedload
+from datetime import datetime, date, timedelta
 import os
 import json
+from pathlib import Path
 from werkzeug.utils import secure_filename
-import uuid
+import secrets
+import threading
+import time
 from reportlab.lib.pagesizes import A4
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -14,22 +21,78 @@ from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 import io
 import base64
-from PIL import Image as PILImage
+import orjson
+import cachetools
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from PIL import Image as PILImage, ImageOps
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Lässt jsonify() über orjson serialisieren statt über stdlib json"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NAIVE_UTC).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 # Konfiguration
 app.config['SECRET_KEY'] = 'bautagebuch-secret-key-2024'
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///bautagebuch.db'
+# DB_URI erlaubt für Tests/Demos eine In-Memory-Datenbank, z.B.
+# DB_URI='sqlite:///file:bautagebuch?mode=memory&cache=shared&uri=true'
+# (keine Platten-I/O, aber alle Daten gehen beim Beenden verloren!)
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DB_URI', 'sqlite:///bautagebuch.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Kleiner Pool reicht: unter WAL blockieren Leser nicht mehr auf Schreiber,
+# Schreibzugriffe serialisiert SQLite ohnehin selbst. check_same_thread=False
+# teilt den Pool über die gthread-Worker, timeout=30 vermeidet
+# "database is locked"-Fehler, pre_ping wäre für eine lokale Datei nur Overhead.
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'pool_size': 5,
+    'max_overflow': 10,
+    'pool_pre_ping': False,
+    'connect_args': {'check_same_thread': False, 'timeout': 30},
+}
 app.config['UPLOAD_FOLDER'] = 'static/uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 
-# Datenbank initialisieren
-db = SQLAlchemy(app)
-
-# Upload-Ordner erstellen
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+# JSON-Responses komprimieren - die Listen-Endpunkte wiederholen dieselben
+# Feldnamen pro Zeile und schrumpfen dadurch um Faktor 5-10
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_MIMETYPES'] = ['application/json']
+app.config['COMPRESS_LEVEL'] = 4
+# Mini-Antworten ({'success': True}, Fehler) nicht komprimieren - da wäre
+# der CPU- und Header-Overhead größer als die Ersparnis
+app.config['COMPRESS_MIN_SIZE'] = 500
+Compress(app)
+
+# Datenbank initialisieren; expire_on_commit=False verhindert das Re-SELECT
+# beim ersten Attributzugriff nach dem Commit (z.B. entry.id in der Response),
+# autoflush=False spart den Flush-Check vor jedem Query
+db = SQLAlchemy(app, session_options={'expire_on_commit': False, 'autoflush': False})
+
+# SQLite-Performance-Einstellungen: WAL-Modus erlaubt gleichzeitige Leser
+# während eines Schreibvorgangs, synchronous=NORMAL spart einen fsync pro
+# Commit, Cache/mmap reduzieren Seitenzugriffe auf die Platte.
+with app.app_context():
+    @event.listens_for(db.engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.execute('PRAGMA cache_size=-20000')
+        cursor.execute('PRAGMA temp_store=MEMORY')
+        cursor.execute('PRAGMA mmap_size=268435456')
+        cursor.execute('PRAGMA foreign_keys=ON')
+        cursor.close()
+
+# Upload-Ordner erstellen; das Path-Objekt einmal cachen, statt den Pfad
+# bei jedem Request neu über den Config-Proxy zusammenzubauen
+UPLOAD_DIR = Path(app.config['UPLOAD_FOLDER'])
+UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 # Datenbankmodelle
 class Project(db.Model):
@@ -61,32 +124,255 @@ class Entry(db.Model):
     # Foreign Key
     project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False)
 
+    # Composite-Index: deckt den Filter auf project_id und die Sortierung
+    # nach Datum in einem Index-Scan ab (kein Tablescan + Sort mehr)
+    __table_args__ = (
+        db.Index('ix_entry_project_date', 'project_id', 'date'),
+    )
+
 class Photo(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     filename = db.Column(db.String(255), nullable=False)
     original_filename = db.Column(db.String(255), nullable=False)
+    # Beim Upload vorskalierte JPEG-Variante für den PDF-Export
+    pdf_thumb_filename = db.Column(db.String(255))
     description = db.Column(db.Text)
     date_taken = db.Column(db.Date, default=date.today)
     file_size = db.Column(db.Integer)
+    # Maße des PDF-Thumbnails - erspart dem Export das Öffnen der Datei
+    # nur für die Seitenverhältnis-Berechnung
+    width = db.Column(db.Integer)
+    height = db.Column(db.Integer)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Löschmarkierung - die Dateien räumt der Hintergrund-GC gebündelt ab
+    deleted_at = db.Column(db.DateTime, index=True, nullable=True)
     
     # Foreign Key
     project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False)
 
+    # Composite-Index analog zu Entry, hier für die Sortierung nach date_taken
+    __table_args__ = (
+        db.Index('ix_photo_project_taken', 'project_id', 'date_taken'),
+    )
+
 # Hilfsfunktionen
+_ALLOWED_SUFFIXES = ('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp')
+
 def allowed_file(filename):
-    ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'bmp', 'webp'}
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    """Prüft den Dateityp und liefert die Endung zurück (oder None)
+
+    endswith mit Suffix-Tupel läuft komplett in C; die Endung wird
+    zurückgegeben, damit der Aufrufer sie nicht erneut schneiden muss.
+    """
+    lowered = filename.lower()
+    if lowered.endswith(_ALLOWED_SUFFIXES):
+        return lowered.rpartition('.')[2]
+    return None
+
+# Response-Cache für die deterministischen GET-Endpunkte; alle schreibenden
+# Endpunkte leeren ihn komplett (bei einem einzigen Projekt reicht das aus).
+# invalidate_cache() wirkt nur im eigenen Worker-Prozess - die kurze TTL
+# begrenzt, wie lange andere gunicorn-Worker nach einem Schreibzugriff noch
+# den alten Stand ausliefern.
+_CACHE = cachetools.TTLCache(maxsize=64, ttl=5)
+
+def cached_json(key, extra_key=None):
+    """Cached den JSON-Body eines GET-Endpunkts unter `key`
+
+    Gecached werden nur die serialisierten Bytes, nicht das Response-Objekt:
+    Flask-Compress verändert die Response im after_request-Hook in-place, ein
+    gecachtes Objekt würde sonst z.B. mit Content-Encoding: br an Clients
+    gehen, die kein Brotli akzeptieren. Mit frischer Response pro Request
+    läuft die Content-Negotiation jedes Mal neu.
+
+    `extra_key` liefert optional einen zusätzlichen Key-Bestandteil für
+    Endpunkte, deren Ergebnis nicht nur von den Daten abhängt (z.B. vom
+    aktuellen Datum).
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = (key, extra_key()) if extra_key else key
+            body = _CACHE.get(cache_key)
+            if body is None:
+                body = func(*args, **kwargs).get_data()
+                _CACHE[cache_key] = body
+            return app.response_class(body, mimetype='application/json')
+        return wrapper
+    return decorator
+
+# Fertig gerenderte PDFs - doc.build() ist mit Abstand der teuerste Teil des
+# Exports, wiederholte Downloads ohne Datenänderung kosten damit nur den Copy
+_PDF_CACHE = cachetools.LRUCache(maxsize=8)
+
+def _pdf_state_key(project):
+    """Datenstand des Projekts als Cache-Key für gerenderte PDFs
+
+    Zeilenanzahl und jüngstes created_at von Einträgen und Fotos ändern
+    sich bei jedem relevanten Schreibzugriff, der Key veraltet also von
+    selbst; zusätzlich leert invalidate_cache() den PDF-Cache komplett.
+    Die Projekt-Stammdaten stehen auf dem Deckblatt und gehören deshalb
+    mit in den Key - invalidate_cache() erreicht unter gunicorn nur den
+    eigenen Worker, ohne Fingerprint würden andere Worker nach einem
+    PUT /api/project das alte PDF ausliefern.
+    """
+    entry_state = db.session.execute(
+        select(db.func.count(Entry.id), db.func.max(Entry.created_at))
+        .where(Entry.project_id == project.id)
+    ).one()
+    photo_state = db.session.execute(
+        select(db.func.count(Photo.id), db.func.max(Photo.created_at))
+        .where(Photo.project_id == project.id, Photo.deleted_at.is_(None))
+    ).one()
+    project_state = (
+        project.id, project.name, project.builder_name,
+        project.start_date, project.status, project.description,
+    )
+    return project_state + tuple(entry_state) + tuple(photo_state)
+
+def invalidate_cache():
+    """Nach jedem Schreibzugriff aufrufen, damit Reads frische Daten sehen"""
+    _CACHE.clear()
+    _PDF_CACHE.clear()
+
+def _load_pdf_image(img_path):
+    """Dekodiert ein Foto für den PDF-Export (läuft im Thread-Pool)
+
+    Pillow gibt den GIL während libjpeg/zlib frei, daher skaliert die
+    Dekodierung über mehrere Kerne. Liefert (JPEG-Puffer, Breite, Höhe)
+    oder None, wenn die Datei fehlt oder nicht lesbar ist.
+    """
+    try:
+        with PILImage.open(img_path) as img:
+            img = ImageOps.exif_transpose(img)
+            img.thumbnail((1200, 1200), PILImage.LANCZOS)
+            if img.mode not in ('RGB', 'L'):
+                img = img.convert('RGB')
+            buffer = io.BytesIO()
+            img.save(buffer, 'JPEG', quality=85)
+            buffer.seek(0)
+            return buffer, img.width, img.height
+    except Exception:
+        return None
+
+def ojsonify(obj):
+    """JSON-Response über orjson - serialisiert date/datetime nativ als ISO-8601"""
+    return app.response_class(
+        orjson.dumps(obj, option=orjson.OPT_NAIVE_UTC),
+        mimetype='application/json'
+    )
+
+# Prozessweiter Cache für die Id des Singleton-Projekts - spart den
+# SELECT pro Request, sobald das Projekt einmal geladen wurde
+_PROJECT_ID = None
 
 def get_or_create_project():
-    """Holt das erste Projekt oder erstellt ein neues"""
-    project = Project.query.first()
-    if not project:
-        project = Project()
-        db.session.add(project)
-        db.session.commit()
+    """Holt das erste Projekt oder erstellt ein neues
+
+    Das Objekt wird zusätzlich pro Request in flask.g gehalten - rufen
+    mehrere Stellen eines Requests das Projekt ab, kostet das nach dem
+    ersten Zugriff gar keinen Lookup mehr.
+    """
+    global _PROJECT_ID
+    if 'project' in g:
+        return g.project
+    project = db.session.get(Project, _PROJECT_ID) if _PROJECT_ID is not None else None
+    if project is None:
+        project = Project.query.first()
+        if not project:
+            project = Project()
+            db.session.add(project)
+            db.session.commit()
+        _PROJECT_ID = project.id
+    g.project = project
     return project
 
+def get_project_id():
+    """Liefert nur die Projekt-Id, ohne die volle Projektzeile zu laden"""
+    if _PROJECT_ID is None:
+        get_or_create_project()
+    return _PROJECT_ID
+
+# ReportLab-Styles einmalig beim Import aufbauen - die Inhalte sind
+# konstant, ein Neuaufbau pro Export wäre reine Allokationsarbeit
+_STYLES = getSampleStyleSheet()
+
+TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_STYLES['Title'],
+    fontSize=24,
+    spaceAfter=30,
+    alignment=TA_CENTER,
+    textColor=colors.darkblue
+)
+
+HEADING_STYLE = ParagraphStyle(
+    'CustomHeading',
+    parent=_STYLES['Heading1'],
+    fontSize=16,
+    spaceAfter=12,
+    spaceBefore=20,
+    textColor=colors.darkblue
+)
+
+SUBHEADING_STYLE = ParagraphStyle(
+    'CustomSubHeading',
+    parent=_STYLES['Heading2'],
+    fontSize=14,
+    spaceAfter=6,
+    spaceBefore=12,
+    textColor=colors.darkgreen
+)
+
+NORMAL_STYLE = ParagraphStyle(
+    'CustomNormal',
+    parent=_STYLES['Normal'],
+    fontSize=11,
+    spaceAfter=6,
+    alignment=TA_LEFT
+)
+
+PROJECT_TABLE_STYLE = TableStyle([
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 11),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ('TOPPADDING', (0, 0), (-1, -1), 6),
+])
+
+STATS_TABLE_STYLE = TableStyle([
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 11),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ('TOPPADDING', (0, 0), (-1, -1), 6),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
+])
+
+ENTRY_TABLE_STYLE = TableStyle([
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+    ('TOPPADDING', (0, 0), (-1, -1), 4),
+])
+
+PHOTO_TABLE_STYLE = TableStyle([
+    ('ALIGN', (0, 0), (0, 0), 'CENTER'),
+    ('ALIGN', (1, 0), (1, 0), 'LEFT'),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('TOPPADDING', (0, 0), (-1, -1), 6),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+])
+
+DETAILS_TABLE_STYLE = TableStyle([
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ('TOPPADDING', (0, 0), (-1, -1), 6),
+])
+
 # Routes
 @app.route('/')
 def index():
@@ -94,6 +380,7 @@ def index():
     return render_template('index.html')
 
 @app.route('/api/project', methods=['GET'])
+@cached_json('project')
 def get_project():
     """Projektinformationen abrufen"""
     project = get_or_create_project()
@@ -101,10 +388,10 @@ def get_project():
         'id': project.id,
         'name': project.name,
         'builder_name': project.builder_name,
-        'start_date': project.start_date.strftime('%Y-%m-%d'),
+        'start_date': project.start_date.isoformat(),
         'status': project.status,
         'description': project.description,
-        'created_at': project.created_at.strftime('%Y-%m-%d %H:%M:%S')
+        'created_at': project.created_at.isoformat(sep=' ', timespec='seconds')
     })
 
 @app.route('/api/project', methods=['PUT'])
@@ -117,48 +404,41 @@ def update_project():
     project.builder_name = data.get('builder_name', project.builder_name)
     
     if 'start_date' in data:
-        project.start_date = datetime.strptime(data['start_date'], '%Y-%m-%d').date()
+        project.start_date = date.fromisoformat(data['start_date'])
     
     project.status = data.get('status', project.status)
     project.description = data.get('description', project.description)
-    
+
     db.session.commit()
+    invalidate_cache()
     return jsonify({'success': True, 'message': 'Projekt aktualisiert'})
 
 @app.route('/api/entries', methods=['GET'])
+@cached_json('entries')
 def get_entries():
     """Alle Einträge abrufen"""
-    project = get_or_create_project()
-    entries = Entry.query.filter_by(project_id=project.id).order_by(Entry.date.desc()).all()
-    
-    entries_data = []
-    for entry in entries:
-        entries_data.append({
-            'id': entry.id,
-            'date': entry.date.strftime('%Y-%m-%d'),
-            'weather': entry.weather,
-            'temperature': entry.temperature,
-            'content': entry.content,
-            'workers_count': entry.workers_count,
-            'materials': entry.materials,
-            'work_hours': entry.work_hours,
-            'costs': entry.costs,
-            'notes': entry.notes,
-            'created_at': entry.created_at.strftime('%Y-%m-%d %H:%M:%S')
-        })
-    
-    return jsonify(entries_data)
+    project_id = get_project_id()
+    # Nur die benötigten Spalten laden statt voller ORM-Objekte
+    rows = db.session.execute(
+        select(
+            Entry.id, Entry.date, Entry.weather, Entry.temperature,
+            Entry.content, Entry.workers_count, Entry.materials,
+            Entry.work_hours, Entry.costs, Entry.notes, Entry.created_at
+        ).where(Entry.project_id == project_id).order_by(Entry.date.desc())
+    ).mappings().all()
+
+    return ojsonify([dict(row) for row in rows])
 
 @app.route('/api/entries', methods=['POST'])
 def create_entry():
     """Neuen Eintrag erstellen"""
-    project = get_or_create_project()
+    project_id = get_project_id()
     data = request.get_json()
-    
+
     try:
         entry = Entry(
-            project_id=project.id,
-            date=datetime.strptime(data['date'], '%Y-%m-%d').date(),
+            project_id=project_id,
+            date=date.fromisoformat(data['date']),
             weather=data.get('weather'),
             temperature=float(data['temperature']) if data.get('temperature') else None,
             content=data['content'],
@@ -171,7 +451,8 @@ def create_entry():
         
         db.session.add(entry)
         db.session.commit()
-        
+        invalidate_cache()
+
         return jsonify({
             'success': True,
             'message': 'Eintrag erstellt',
@@ -182,33 +463,70 @@ def create_entry():
         db.session.rollback()
         return jsonify({'success': False, 'error': str(e)}), 400
 
+@app.route('/api/entries/bulk', methods=['POST'])
+def create_entries_bulk():
+    """Mehrere Einträge in einem Batch anlegen (z.B. für Importe)"""
+    project_id = get_project_id()
+    data = request.get_json()
+
+    try:
+        mappings = []
+        for row in data:
+            mappings.append({
+                'project_id': project_id,
+                'date': date.fromisoformat(row['date']),
+                'weather': row.get('weather'),
+                'temperature': float(row['temperature']) if row.get('temperature') else None,
+                'content': row['content'],
+                'workers_count': int(row['workers_count']) if row.get('workers_count') else None,
+                'materials': row.get('materials'),
+                'work_hours': float(row['work_hours']) if row.get('work_hours') else None,
+                'costs': float(row['costs']) if row.get('costs') else None,
+                'notes': row.get('notes')
+            })
+
+        # Ein INSERT pro Batch statt N einzelner ORM-Objekte
+        db.session.bulk_insert_mappings(Entry, mappings)
+        db.session.commit()
+        invalidate_cache()
+
+        return jsonify({
+            'success': True,
+            'message': f'{len(mappings)} Einträge erstellt'
+        })
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 400
+
 @app.route('/api/entries/<int:entry_id>', methods=['DELETE'])
 def delete_entry(entry_id):
     """Eintrag löschen"""
-    entry = Entry.query.get_or_404(entry_id)
-    db.session.delete(entry)
+    # Direktes DELETE statt SELECT + ORM-Instanz + Unit-of-Work-Delete;
+    # rowcount ersetzt den get_or_404-Lookup
+    result = db.session.execute(delete(Entry).where(Entry.id == entry_id))
+    if result.rowcount == 0:
+        abort(404)
     db.session.commit()
+    invalidate_cache()
     return jsonify({'success': True, 'message': 'Eintrag gelöscht'})
 
 @app.route('/api/photos', methods=['GET'])
+@cached_json('photos')
 def get_photos():
     """Alle Fotos abrufen"""
-    project = get_or_create_project()
-    photos = Photo.query.filter_by(project_id=project.id).order_by(Photo.date_taken.desc()).all()
-    
-    photos_data = []
-    for photo in photos:
-        photos_data.append({
-            'id': photo.id,
-            'filename': photo.filename,
-            'original_filename': photo.original_filename,
-            'description': photo.description,
-            'date_taken': photo.date_taken.strftime('%Y-%m-%d'),
-            'file_size': photo.file_size,
-            'url': f'/static/uploads/{photo.filename}'
-        })
-    
-    return jsonify(photos_data)
+    project_id = get_project_id()
+    rows = db.session.execute(
+        select(
+            Photo.id, Photo.filename, Photo.original_filename,
+            Photo.description, Photo.date_taken, Photo.file_size
+        ).where(Photo.project_id == project_id, Photo.deleted_at.is_(None))
+        .order_by(Photo.date_taken.desc())
+    ).mappings().all()
+
+    return ojsonify([
+        {**row, 'url': f"/uploads/{row['filename']}"} for row in rows
+    ])
 
 @app.route('/api/photos', methods=['POST'])
 def upload_photo():
@@ -217,85 +535,146 @@ def upload_photo():
         return jsonify({'success': False, 'error': 'Keine Datei ausgewählt'}), 400
     
     file = request.files['file']
-    if file.filename == '' or not allowed_file(file.filename):
+    file_extension = allowed_file(file.filename) if file.filename else None
+    if not file_extension:
         return jsonify({'success': False, 'error': 'Ungültiger Dateityp'}), 400
-    
-    project = get_or_create_project()
-    
+
+    project_id = get_project_id()
+
     # Eindeutigen Dateinamen generieren
-    file_extension = file.filename.rsplit('.', 1)[1].lower()
-    unique_filename = f"{uuid.uuid4().hex}.{file_extension}"
-    file_path = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
+    unique_filename = f"{secrets.token_hex(16)}.{file_extension}"
+    file_path = UPLOAD_DIR / unique_filename
     
+    thumb_filename = None
+    thumb_width = thumb_height = None
     try:
-        file.save(file_path)
-        file_size = os.path.getsize(file_path)
-        
+        # Upload in 1-MB-Blöcken direkt auf die Platte streamen und die Größe
+        # dabei mitzählen - erspart das anschließende stat() über getsize()
+        file_size = 0
+        with open(file_path, 'wb') as out:
+            while chunk := file.stream.read(1 << 20):
+                out.write(chunk)
+                file_size += len(chunk)
+
+        # PDF-Thumbnail einmalig beim Upload erzeugen, damit der Export nicht
+        # jedes Mal das volle Original dekodieren und einbetten muss
+        try:
+            with PILImage.open(file_path) as img:
+                img = ImageOps.exif_transpose(img)
+                img.thumbnail((1200, 1200), PILImage.LANCZOS)
+                if img.mode not in ('RGB', 'L'):
+                    img = img.convert('RGB')
+                thumb_filename = f"{file_path.stem}_pdf.jpg"
+                img.save(UPLOAD_DIR / thumb_filename, 'JPEG',
+                         quality=85, optimize=True, progressive=True)
+                thumb_width, thumb_height = img.size
+        except Exception:
+            # Bild nicht lesbar - Export fällt aufs Original zurück
+            thumb_filename = None
+            thumb_width = thumb_height = None
+
         photo = Photo(
-            project_id=project.id,
+            project_id=project_id,
             filename=unique_filename,
             original_filename=secure_filename(file.filename),
+            pdf_thumb_filename=thumb_filename,
             description=request.form.get('description', ''),
-            file_size=file_size
+            file_size=file_size,
+            width=thumb_width,
+            height=thumb_height
         )
         
         db.session.add(photo)
         db.session.commit()
-        
+        invalidate_cache()
+
         return jsonify({
             'success': True,
             'message': 'Foto hochgeladen',
             'photo': {
                 'id': photo.id,
                 'filename': photo.filename,
-                'url': f'/static/uploads/{photo.filename}'
+                'url': f'/uploads/{photo.filename}'
             }
         })
     
     except Exception as e:
         db.session.rollback()
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        file_path.unlink(missing_ok=True)
+        if thumb_filename:
+            (UPLOAD_DIR / thumb_filename).unlink(missing_ok=True)
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/photos/<int:photo_id>', methods=['DELETE'])
 def delete_photo(photo_id):
-    """Foto löschen"""
-    photo = Photo.query.get_or_404(photo_id)
-    file_path = os.path.join(app.config['UPLOAD_FOLDER'], photo.filename)
-    
-    try:
-        # Datei löschen
-        if os.path.exists(file_path):
-            os.remove(file_path)
-        
-        # Datenbankeintrag löschen
-        db.session.delete(photo)
-        db.session.commit()
-        
-        return jsonify({'success': True, 'message': 'Foto gelöscht'})
-    
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'success': False, 'error': str(e)}), 500
+    """Foto löschen
+
+    Markiert die Zeile nur als gelöscht - Datei-Unlinks und das endgültige
+    DELETE übernimmt der Hintergrund-GC gebündelt, der Request selbst
+    kostet damit nur ein UPDATE (ohne vorheriges SELECT der vollen Zeile).
+    """
+    result = db.session.execute(
+        update(Photo)
+        .where(Photo.id == photo_id, Photo.deleted_at.is_(None))
+        .values(deleted_at=datetime.utcnow())
+    )
+    if result.rowcount == 0:
+        abort(404)
+    db.session.commit()
+    invalidate_cache()
+    return jsonify({'success': True, 'message': 'Foto gelöscht'})
+
+@app.route('/uploads/<path:name>')
+def serve_upload(name):
+    """Hochgeladene Fotos mit Browser-Caching ausliefern
+
+    conditional=True liefert ETag/Last-Modified und beantwortet
+    Wiederholungsanfragen mit 304 ohne Body; ein Jahr max-age plus
+    immutable ist sicher, weil die Dateinamen zufällige Hex-Strings sind
+    und sich nie ändern - der Browser fragt dann gar nicht erst nach.
+    """
+    response = send_from_directory(UPLOAD_DIR, name, conditional=True, max_age=31536000)
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
+@app.route('/api/photos/<int:photo_id>/download', methods=['GET'])
+def download_photo(photo_id):
+    """Foto-Download über den Reverse-Proxy (X-Accel-Redirect)
+
+    Nginx liefert die Datei per sendfile() direkt aus dem Page-Cache,
+    ohne dass die Bytes durch Python laufen. Dafür muss eine interne
+    Location /protected/uploads/ konfiguriert sein (siehe README).
+    Ohne Proxy funktioniert weiterhin der direkte /static/uploads-Pfad.
+    """
+    # Soft-gelöschte Fotos sind wie auf allen anderen Lesepfaden unsichtbar
+    photo = Photo.query.filter_by(id=photo_id, deleted_at=None).first_or_404()
+    response = app.response_class(status=200)
+    response.headers['X-Accel-Redirect'] = f'/protected/uploads/{photo.filename}'
+    response.headers['Content-Disposition'] = f'attachment; filename="{photo.original_filename}"'
+    return response
 
 @app.route('/api/stats', methods=['GET'])
+# project_days hängt über date.today() vom aktuellen Datum ab - das Datum
+# gehört deshalb mit in den Cache-Key, sonst stimmt der Wert nach
+# Mitternacht nicht mehr
+@cached_json('stats', extra_key=date.today)
 def get_stats():
     """Statistiken abrufen"""
     project = get_or_create_project()
     
-    total_entries = Entry.query.filter_by(project_id=project.id).count()
-    total_photos = Photo.query.filter_by(project_id=project.id).count()
-    
+    # Alle Entry-Aggregate in einem Statement statt drei einzelner Queries
+    total_entries, total_costs, total_hours = db.session.execute(
+        select(
+            db.func.count(Entry.id),
+            db.func.coalesce(db.func.sum(Entry.costs), 0),
+            db.func.coalesce(db.func.sum(Entry.work_hours), 0)
+        ).where(Entry.project_id == project.id)
+    ).one()
+    total_photos = Photo.query.filter_by(project_id=project.id, deleted_at=None).count()
+
     # Projekttage berechnen
     project_days = (date.today() - project.start_date).days + 1
-    
-    # Gesamtkosten berechnen
-    total_costs = db.session.query(db.func.sum(Entry.costs)).filter_by(project_id=project.id).scalar() or 0
-    
-    # Gesamtarbeitsstunden
-    total_hours = db.session.query(db.func.sum(Entry.work_hours)).filter_by(project_id=project.id).scalar() or 0
-    
+
     return jsonify({
         'total_entries': total_entries,
         'total_photos': total_photos,
@@ -309,315 +688,364 @@ def get_stats():
 def export_data():
     """Daten als JSON exportieren"""
     project = get_or_create_project()
-    entries = Entry.query.filter_by(project_id=project.id).all()
-    photos = Photo.query.filter_by(project_id=project.id).all()
-    
-    export_data = {
-        'project': {
-            'name': project.name,
-            'builder_name': project.builder_name,
-            'start_date': project.start_date.strftime('%Y-%m-%d'),
-            'status': project.status,
-            'description': project.description
-        },
-        'entries': [],
-        'photos': []
+    project_id = project.id
+    project_dict = {
+        'name': project.name,
+        'builder_name': project.builder_name,
+        'start_date': project.start_date,
+        'status': project.status,
+        'description': project.description
     }
-    
-    for entry in entries:
-        export_data['entries'].append({
-            'date': entry.date.strftime('%Y-%m-%d'),
-            'weather': entry.weather,
-            'temperature': entry.temperature,
-            'content': entry.content,
-            'workers_count': entry.workers_count,
-            'materials': entry.materials,
-            'work_hours': entry.work_hours,
-            'costs': entry.costs,
-            'notes': entry.notes
-        })
-    
-    for photo in photos:
-        export_data['photos'].append({
-            'filename': photo.original_filename,
-            'description': photo.description,
-            'date_taken': photo.date_taken.strftime('%Y-%m-%d')
-        })
-    
-    return jsonify(export_data)
-
-# Neue Route für PDF-Export hinzufügen:
 
-@app.route('/api/export/pdf', methods=['GET'])
-def export_pdf():
-    """Bautagebuch als PDF exportieren"""
-    try:
-        project = get_or_create_project()
-        entries = Entry.query.filter_by(project_id=project.id).order_by(Entry.date.asc()).all()
-        photos = Photo.query.filter_by(project_id=project.id).order_by(Photo.date_taken.asc()).all()
+    def generate():
+        """Streamt den Export zeilenweise, statt ihn komplett im RAM aufzubauen"""
+        yield b'{"project":' + orjson.dumps(project_dict, option=orjson.OPT_NAIVE_UTC)
+
+        yield b',"entries":['
+        entry_rows = db.session.execute(
+            select(
+                Entry.date, Entry.weather, Entry.temperature, Entry.content,
+                Entry.workers_count, Entry.materials, Entry.work_hours,
+                Entry.costs, Entry.notes
+            ).where(Entry.project_id == project_id)
+            .execution_options(yield_per=500)
+        ).mappings()
+        for i, row in enumerate(entry_rows):
+            if i:
+                yield b','
+            yield orjson.dumps(dict(row), option=orjson.OPT_NAIVE_UTC)
+
+        yield b'],"photos":['
+        photo_rows = db.session.execute(
+            select(
+                Photo.original_filename.label('filename'),
+                Photo.description, Photo.date_taken
+            ).where(Photo.project_id == project_id, Photo.deleted_at.is_(None))
+            .execution_options(yield_per=500)
+        ).mappings()
+        for i, row in enumerate(photo_rows):
+            if i:
+                yield b','
+            yield orjson.dumps(dict(row), option=orjson.OPT_NAIVE_UTC)
+
+        yield b']}'
+
+    return app.response_class(stream_with_context(generate()), mimetype='application/json')
 
-        # PDF in Memory erstellen
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=A4,
-            rightMargin=2 * cm,
-            leftMargin=2 * cm,
-            topMargin=2 * cm,
-            bottomMargin=2 * cm
-        )
+# Neue Route für PDF-Export hinzufügen:
 
-        # Styles definieren
-        styles = getSampleStyleSheet()
-
-        # Custom Styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Title'],
-            fontSize=24,
-            spaceAfter=30,
-            alignment=TA_CENTER,
-            textColor=colors.darkblue
-        )
+def _render_project_pdf(project):
+    """Baut das komplette Bautagebuch-PDF und liefert die Bytes
+
+    Läuft sowohl synchron im Request als auch im Hintergrund-Job-Thread;
+    das Caching übernimmt der jeweilige Aufrufer.
+    """
+    # Einträge in 200er-Batches streamen statt alle Zeilen (plus
+    # Identity-Map) vor dem ersten gerenderten Byte im RAM zu halten;
+    # die Fotoliste bleibt materialisiert, weil der Thread-Pool und die
+    # Layout-Schleife sie beide durchlaufen
+    entries = Entry.query.filter_by(project_id=project.id).order_by(Entry.date.asc()).yield_per(200)
+    photos = Photo.query.filter_by(project_id=project.id, deleted_at=None).order_by(Photo.date_taken.asc()).all()
+
+    # PDF in Memory erstellen
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        rightMargin=2 * cm,
+        leftMargin=2 * cm,
+        topMargin=2 * cm,
+        bottomMargin=2 * cm
+    )
+
+    # PDF Content aufbauen
+    story = []
+
+    # Titel
+    story.append(Paragraph("Bautagebuch", TITLE_STYLE))
+    story.append(Paragraph(f"Projekt: {project.name}", HEADING_STYLE))
+    story.append(Spacer(1, 20))
+
+    # Projektinformationen
+    story.append(Paragraph("Projektinformationen", HEADING_STYLE))
+
+    project_data = [
+        ['Projektname:', project.name],
+        ['Bauherr:', project.builder_name],
+        ['Startdatum:', project.start_date.strftime('%d.%m.%Y')],
+        ['Status:', project.status],
+        ['Beschreibung:', project.description or 'Keine Beschreibung']
+    ]
+
+    project_table = Table(project_data, colWidths=[4 * cm, 12 * cm])
+    project_table.setStyle(PROJECT_TABLE_STYLE)
+
+    story.append(project_table)
+    story.append(Spacer(1, 20))
+
+    # Statistiken - Aggregate in SQL statt doppelter Python-Iteration
+    # über alle Zeilen (gleiches Muster wie in get_stats)
+    total_entries, total_costs, total_hours = db.session.execute(
+        select(
+            db.func.count(Entry.id),
+            db.func.coalesce(db.func.sum(Entry.costs), 0),
+            db.func.coalesce(db.func.sum(Entry.work_hours), 0)
+        ).where(Entry.project_id == project.id)
+    ).one()
+    total_photos = len(photos)
+    project_days = (date.today() - project.start_date).days + 1
 
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading1'],
-            fontSize=16,
-            spaceAfter=12,
-            spaceBefore=20,
-            textColor=colors.darkblue
-        )
+    story.append(Paragraph("Projektstatistiken", HEADING_STYLE))
+
+    stats_data = [
+        ['Gesamte Einträge:', str(total_entries)],
+        ['Gesamte Fotos:', str(total_photos)],
+        ['Projekttage:', str(project_days)],
+        ['Gesamtkosten:', f"{total_costs:.2f} €"],
+        ['Gesamtarbeitsstunden:', f"{total_hours:.1f} h"]
+    ]
+
+    stats_table = Table(stats_data, colWidths=[4 * cm, 12 * cm])
+    stats_table.setStyle(STATS_TABLE_STYLE)
+
+    story.append(stats_table)
+    story.append(PageBreak())
+
+    # Einträge
+    story.append(Paragraph("Bautagebuch-Einträge", HEADING_STYLE))
+    story.append(Spacer(1, 12))
+
+    for i, entry in enumerate(entries):
+        # Datum als Überschrift
+        story.append(Paragraph(
+            f"Eintrag {i + 1}: {entry.date.strftime('%d.%m.%Y')}",
+            SUBHEADING_STYLE
+        ))
+
+        # Entry Details Table
+        entry_data = []
+
+        if entry.weather:
+            entry_data.append(['Wetter:', entry.weather])
+        if entry.temperature:
+            entry_data.append(['Temperatur:', f"{entry.temperature}°C"])
+        if entry.workers_count:
+            entry_data.append(['Arbeiter:', str(entry.workers_count)])
+        if entry.work_hours:
+            entry_data.append(['Arbeitsstunden:', f"{entry.work_hours} h"])
+        if entry.costs:
+            entry_data.append(['Kosten:', f"{entry.costs:.2f} €"])
+
+        if entry_data:
+            entry_table = Table(entry_data, colWidths=[3 * cm, 8 * cm])
+            entry_table.setStyle(ENTRY_TABLE_STYLE)
+            story.append(entry_table)
+            story.append(Spacer(1, 8))
 
-        subheading_style = ParagraphStyle(
-            'CustomSubHeading',
-            parent=styles['Heading2'],
-            fontSize=14,
-            spaceAfter=6,
-            spaceBefore=12,
-            textColor=colors.darkgreen
-        )
+        # Arbeitsinhalt
+        story.append(Paragraph("<b>Arbeitsinhalt:</b>", NORMAL_STYLE))
+        story.append(Paragraph(entry.content, NORMAL_STYLE))
+        story.append(Spacer(1, 6))
 
-        normal_style = ParagraphStyle(
-            'CustomNormal',
-            parent=styles['Normal'],
-            fontSize=11,
-            spaceAfter=6,
-            alignment=TA_LEFT
-        )
+        # Materialien
+        if entry.materials:
+            story.append(Paragraph("<b>Materialien:</b>", NORMAL_STYLE))
+            story.append(Paragraph(entry.materials, NORMAL_STYLE))
+            story.append(Spacer(1, 6))
 
-        # PDF Content aufbauen
-        story = []
+        # Notizen
+        if entry.notes:
+            story.append(Paragraph("<b>Notizen:</b>", NORMAL_STYLE))
+            story.append(Paragraph(entry.notes, NORMAL_STYLE))
+            story.append(Spacer(1, 6))
 
-        # Titel
-        story.append(Paragraph("Bautagebuch", title_style))
-        story.append(Paragraph(f"Projekt: {project.name}", heading_style))
-        story.append(Spacer(1, 20))
+        story.append(Spacer(1, 15))
 
-        # Projektinformationen
-        story.append(Paragraph("Projektinformationen", heading_style))
-
-        project_data = [
-            ['Projektname:', project.name],
-            ['Bauherr:', project.builder_name],
-            ['Startdatum:', project.start_date.strftime('%d.%m.%Y')],
-            ['Status:', project.status],
-            ['Beschreibung:', project.description or 'Keine Beschreibung']
-        ]
-
-        project_table = Table(project_data, colWidths=[4 * cm, 12 * cm])
-        project_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-        ]))
-
-        story.append(project_table)
-        story.append(Spacer(1, 20))
+        # Seitenwechsel nach jedem 3. Eintrag
+        if (i + 1) % 3 == 0 and i < total_entries - 1:
+            story.append(PageBreak())
 
-        # Statistiken
-        total_entries = len(entries)
-        total_photos = len(photos)
-        project_days = (date.today() - project.start_date).days + 1
-        total_costs = sum(entry.costs or 0 for entry in entries)
-        total_hours = sum(entry.work_hours or 0 for entry in entries)
-
-        story.append(Paragraph("Projektstatistiken", heading_style))
-
-        stats_data = [
-            ['Gesamte Einträge:', str(total_entries)],
-            ['Gesamte Fotos:', str(total_photos)],
-            ['Projekttage:', str(project_days)],
-            ['Gesamtkosten:', f"{total_costs:.2f} €"],
-            ['Gesamtarbeitsstunden:', f"{total_hours:.1f} h"]
-        ]
-
-        stats_table = Table(stats_data, colWidths=[4 * cm, 12 * cm])
-        stats_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
-        ]))
-
-        story.append(stats_table)
+    # Fotos Sektion
+    if photos:
         story.append(PageBreak())
-
-        # Einträge
-        story.append(Paragraph("Bautagebuch-Einträge", heading_style))
+        story.append(Paragraph("Projektfotos", HEADING_STYLE))
         story.append(Spacer(1, 12))
 
-        for i, entry in enumerate(entries):
-            # Datum als Überschrift
-            story.append(Paragraph(
-                f"Eintrag {i + 1}: {entry.date.strftime('%d.%m.%Y')}",
-                subheading_style
-            ))
-
-            # Entry Details Table
-            entry_data = []
+        # Dekodieren/Skalieren läuft parallel im Thread-Pool; das
+        # vorskalierte Thumbnail wird bevorzugt, das Original ist nur
+        # Fallback für Altbestände. Die (schnellen) story.append-Schritte
+        # bleiben danach single-threaded und in Eingabereihenfolge.
+        # Ein Verzeichnis-Scan statt einem stat()-Syscall pro Foto
+        existing = {e.name for e in os.scandir(UPLOAD_DIR)}
+
+        def prepare_photo(photo):
+            """Liefert (Bildquelle, Breite, Höhe) für ReportLab oder None"""
+            name = photo.pdf_thumb_filename or photo.filename
+            if name not in existing:
+                return None
+            # Thumbnail mit bekannten Maßen: Datei direkt einbetten,
+            # ganz ohne Pillow-Decode
+            if photo.pdf_thumb_filename and photo.width and photo.height:
+                return str(UPLOAD_DIR / name), photo.width, photo.height
+            # Altbestand ohne Thumbnail/Maße: dekodieren und skalieren
+            return _load_pdf_image(UPLOAD_DIR / name)
+
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+            decoded = list(pool.map(prepare_photo, photos))
+
+        photos_per_page = 4
+        for i, (photo, result) in enumerate(zip(photos, decoded)):
+            if result is not None:
+                img_source, img_width, img_height = result
+
+                # Maximale Größe für PDF
+                max_width = 8 * cm
+                max_height = 6 * cm
+
+                # Aspect Ratio beibehalten
+                aspect = img_width / img_height
+
+                if aspect > max_width / max_height:
+                    # Bild ist breiter
+                    pdf_width = max_width
+                    pdf_height = max_width / aspect
+                else:
+                    # Bild ist höher
+                    pdf_height = max_height
+                    pdf_width = max_height * aspect
+
+                # Bild zu PDF hinzufügen
+                img = Image(img_source, width=pdf_width, height=pdf_height)
+
+                # Foto-Info
+                photo_info = f"<b>{photo.original_filename}</b><br/>"
+                photo_info += f"Datum: {photo.date_taken.strftime('%d.%m.%Y')}<br/>"
+                if photo.description:
+                    photo_info += f"Beschreibung: {photo.description}"
+
+                # Foto und Info in Tabelle
+                photo_table = Table([[img, Paragraph(photo_info, NORMAL_STYLE)]],
+                                    colWidths=[pdf_width + 1 * cm, 8 * cm])
+                photo_table.setStyle(PHOTO_TABLE_STYLE)
+
+                story.append(photo_table)
+                story.append(Spacer(1, 12))
+
+                # Seitenwechsel nach bestimmter Anzahl Fotos
+                if (i + 1) % photos_per_page == 0 and i < len(photos) - 1:
+                    story.append(PageBreak())
+
+            else:
+                # Fehler beim Laden des Bildes - Info hinzufügen
+                error_text = f"<b>{photo.original_filename}</b> (Bild konnte nicht geladen werden)<br/>"
+                error_text += f"Datum: {photo.date_taken.strftime('%d.%m.%Y')}<br/>"
+                if photo.description:
+                    error_text += f"Beschreibung: {photo.description}"
+
+                story.append(Paragraph(error_text, NORMAL_STYLE))
+                story.append(Spacer(1, 12))
+
+
+    # PDF generieren
+    doc.build(story)
+    return buffer.getvalue()
+
+def _get_or_render_pdf(project):
+    """Liefert das Projekt-PDF aus dem Cache oder rendert es neu"""
+    cache_key = _pdf_state_key(project)
+    pdf_bytes = _PDF_CACHE.get(cache_key)
+    if pdf_bytes is None:
+        pdf_bytes = _render_project_pdf(project)
+        _PDF_CACHE[cache_key] = pdf_bytes
+    return pdf_bytes
+
+def _pdf_download_name(project):
+    """Dateiname für den PDF-Download"""
+    return f"Bautagebuch_{project.name.replace(' ', '_')}_{date.today().strftime('%Y%m%d')}.pdf"
 
-            if entry.weather:
-                entry_data.append(['Wetter:', entry.weather])
-            if entry.temperature:
-                entry_data.append(['Temperatur:', f"{entry.temperature}°C"])
-            if entry.workers_count:
-                entry_data.append(['Arbeiter:', str(entry.workers_count)])
-            if entry.work_hours:
-                entry_data.append(['Arbeitsstunden:', f"{entry.work_hours} h"])
-            if entry.costs:
-                entry_data.append(['Kosten:', f"{entry.costs:.2f} €"])
-
-            if entry_data:
-                entry_table = Table(entry_data, colWidths=[3 * cm, 8 * cm])
-                entry_table.setStyle(TableStyle([
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 10),
-                    ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-                    ('TOPPADDING', (0, 0), (-1, -1), 4),
-                ]))
-                story.append(entry_table)
-                story.append(Spacer(1, 8))
-
-            # Arbeitsinhalt
-            story.append(Paragraph("<b>Arbeitsinhalt:</b>", normal_style))
-            story.append(Paragraph(entry.content, normal_style))
-            story.append(Spacer(1, 6))
-
-            # Materialien
-            if entry.materials:
-                story.append(Paragraph("<b>Materialien:</b>", normal_style))
-                story.append(Paragraph(entry.materials, normal_style))
-                story.append(Spacer(1, 6))
-
-            # Notizen
-            if entry.notes:
-                story.append(Paragraph("<b>Notizen:</b>", normal_style))
-                story.append(Paragraph(entry.notes, normal_style))
-                story.append(Spacer(1, 6))
-
-            story.append(Spacer(1, 15))
-
-            # Seitenwechsel nach jedem 3. Eintrag
-            if (i + 1) % 3 == 0 and i < len(entries) - 1:
-                story.append(PageBreak())
-
-        # Fotos Sektion
-        if photos:
-            story.append(PageBreak())
-            story.append(Paragraph("Projektfotos", heading_style))
-            story.append(Spacer(1, 12))
-
-            photos_per_page = 4
-            for i, photo in enumerate(photos):
-                try:
-                    # Bild laden und skalieren
-                    img_path = os.path.join(app.config['UPLOAD_FOLDER'], photo.filename)
-                    if os.path.exists(img_path):
-                        # Bild öffnen und Größe prüfen
-                        with PILImage.open(img_path) as pil_img:
-                            # Maximale Größe für PDF
-                            max_width = 8 * cm
-                            max_height = 6 * cm
-
-                            # Aspect Ratio beibehalten
-                            img_width, img_height = pil_img.size
-                            aspect = img_width / img_height
-
-                            if aspect > max_width / max_height:
-                                # Bild ist breiter
-                                pdf_width = max_width
-                                pdf_height = max_width / aspect
-                            else:
-                                # Bild ist höher
-                                pdf_height = max_height
-                                pdf_width = max_height * aspect
-
-                        # Bild zu PDF hinzufügen
-                        img = Image(img_path, width=pdf_width, height=pdf_height)
-
-                        # Foto-Info
-                        photo_info = f"<b>{photo.original_filename}</b><br/>"
-                        photo_info += f"Datum: {photo.date_taken.strftime('%d.%m.%Y')}<br/>"
-                        if photo.description:
-                            photo_info += f"Beschreibung: {photo.description}"
-
-                        # Foto und Info in Tabelle
-                        photo_table = Table([[img, Paragraph(photo_info, normal_style)]],
-                                            colWidths=[pdf_width + 1 * cm, 8 * cm])
-                        photo_table.setStyle(TableStyle([
-                            ('ALIGN', (0, 0), (0, 0), 'CENTER'),
-                            ('ALIGN', (1, 0), (1, 0), 'LEFT'),
-                            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                            ('TOPPADDING', (0, 0), (-1, -1), 6),
-                            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-                        ]))
-
-                        story.append(photo_table)
-                        story.append(Spacer(1, 12))
-
-                        # Seitenwechsel nach bestimmter Anzahl Fotos
-                        if (i + 1) % photos_per_page == 0 and i < len(photos) - 1:
-                            story.append(PageBreak())
-
-                except Exception as e:
-                    # Fehler beim Laden des Bildes - Info hinzufügen
-                    error_text = f"<b>{photo.original_filename}</b> (Bild konnte nicht geladen werden)<br/>"
-                    error_text += f"Datum: {photo.date_taken.strftime('%d.%m.%Y')}<br/>"
-                    if photo.description:
-                        error_text += f"Beschreibung: {photo.description}"
-
-                    story.append(Paragraph(error_text, normal_style))
-                    story.append(Spacer(1, 12))
-
-        # PDF generieren
-        doc.build(story)
-        buffer.seek(0)
-
-        # PDF als Download zurückgeben
-        filename = f"Bautagebuch_{project.name.replace(' ', '_')}_{date.today().strftime('%Y%m%d')}.pdf"
+@app.route('/api/export/pdf', methods=['GET'])
+def export_pdf():
+    """Bautagebuch als PDF exportieren"""
+    try:
+        project = get_or_create_project()
+        pdf_bytes = _get_or_render_pdf(project)
 
         return send_file(
-            buffer,
+            io.BytesIO(pdf_bytes),
             as_attachment=True,
-            download_name=filename,
+            download_name=_pdf_download_name(project),
             mimetype='application/pdf'
         )
 
     except Exception as e:
         return jsonify({'success': False, 'error': f'PDF-Export fehlgeschlagen: {str(e)}'}), 500
 
+# PDF-Export als Hintergrund-Job: der HTTP-Worker gibt sofort eine Job-Id
+# zurück, der (teure) ReportLab-Build läuft in einem eigenen Thread und
+# blockiert damit keine anderen Requests. Der Job-Zustand liegt als Datei
+# in EXPORT_DIR statt in einem Dict, weil gunicorn mehrere Worker-Prozesse
+# startet und der Poll sonst meist bei einem Worker landet, der den Job
+# nicht kennt.
+EXPORT_DIR = Path('static/exports')
+EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+
+def _run_pdf_job(job_id):
+    with app.app_context():
+        try:
+            project = get_or_create_project()
+            pdf_bytes = _get_or_render_pdf(project)
+            # Erst in eine Temp-Datei schreiben, dann atomar umbenennen -
+            # der Poll-Endpunkt sieht nie ein halb geschriebenes PDF
+            tmp_path = EXPORT_DIR / f'{job_id}.tmp'
+            tmp_path.write_bytes(pdf_bytes)
+            tmp_path.rename(EXPORT_DIR / f'{job_id}.pdf')
+        except Exception as e:
+            (EXPORT_DIR / f'{job_id}.error').write_text(str(e))
+        finally:
+            (EXPORT_DIR / f'{job_id}.pending').unlink(missing_ok=True)
+
+@app.route('/api/export/pdf', methods=['POST'])
+def start_pdf_export():
+    """PDF-Export im Hintergrund starten - Antwort enthält die Job-Id"""
+    job_id = secrets.token_hex(16)
+    (EXPORT_DIR / f'{job_id}.pending').touch()
+    threading.Thread(target=_run_pdf_job, args=(job_id,), daemon=True).start()
+    return jsonify({'success': True, 'job_id': job_id}), 202
+
+@app.route('/api/export/pdf/<job_id>', methods=['GET'])
+def poll_pdf_export(job_id):
+    """Job-Status abfragen bzw. fertiges PDF herunterladen"""
+    if not job_id.isalnum():
+        return jsonify({'error': 'Nicht gefunden'}), 404
+    pdf_path = EXPORT_DIR / f'{job_id}.pdf'
+    if pdf_path.is_file():
+        pdf_bytes = pdf_path.read_bytes()
+        # Fertige Jobs nach dem Download entfernen, sonst sammeln sich
+        # die Dateien unbegrenzt an; Nachzügler räumt der GC-Sweep ab
+        pdf_path.unlink(missing_ok=True)
+        return send_file(
+            io.BytesIO(pdf_bytes),
+            as_attachment=True,
+            download_name=_pdf_download_name(get_or_create_project()),
+            mimetype='application/pdf'
+        )
+    error_path = EXPORT_DIR / f'{job_id}.error'
+    if error_path.is_file():
+        error = error_path.read_text()
+        error_path.unlink(missing_ok=True)
+        return jsonify({'status': 'fehler', 'error': error}), 500
+    if (EXPORT_DIR / f'{job_id}.pending').is_file():
+        return jsonify({'status': 'laeuft'}), 202
+    return jsonify({'error': 'Nicht gefunden'}), 404
+
 
 @app.route('/api/export/pdf/entry/<int:entry_id>', methods=['GET'])
 def export_single_entry_pdf(entry_id):
     """Einzelnen Eintrag als PDF exportieren"""
     try:
-        entry = Entry.query.get_or_404(entry_id)
+        # Projekt per JOIN mitladen, statt es beim Zugriff auf entry.project
+        # lazy über ein zweites SELECT nachzuladen
+        entry = Entry.query.options(joinedload(Entry.project)).get_or_404(entry_id)
         project = entry.project
 
         # PDF in Memory erstellen
@@ -631,7 +1059,7 @@ def export_single_entry_pdf(entry_id):
             bottomMargin=2 * cm
         )
 
-        styles = getSampleStyleSheet()
+        styles = _STYLES
         story = []
 
         # Titel
@@ -657,13 +1085,7 @@ def export_single_entry_pdf(entry_id):
                 details_data.append(['Kosten:', f"{entry.costs:.2f} €"])
 
             details_table = Table(details_data, colWidths=[4 * cm, 10 * cm])
-            details_table.setStyle(TableStyle([
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ]))
+            details_table.setStyle(DETAILS_TABLE_STYLE)
 
             story.append(details_table)
             story.append(Spacer(1, 20))
@@ -700,6 +1122,49 @@ def export_single_entry_pdf(entry_id):
     except Exception as e:
         return jsonify({'success': False, 'error': f'PDF-Export fehlgeschlagen: {str(e)}'}), 500
 
+# Hintergrund-GC für gelöschte Fotos: sammelt markierte Zeilen ein, löscht
+# die Dateien in einem sequentiellen Durchlauf und räumt die Zeilen mit
+# einem einzigen DELETE ab
+_PHOTO_GC_INTERVAL = 300  # Sekunden zwischen zwei Durchläufen
+_PHOTO_GC_GRACE = 300     # Mindestalter der Markierung vor dem Aufräumen
+_EXPORT_MAX_AGE = 3600    # nie abgeholte PDF-Exporte nach einer Stunde löschen
+
+def _photo_gc_loop():
+    while True:
+        time.sleep(_PHOTO_GC_INTERVAL)
+        # Liegengebliebene Export-Dateien abräumen (Jobs, deren Ergebnis
+        # nie heruntergeladen wurde, oder verwaiste pending-Marker)
+        try:
+            export_cutoff = time.time() - _EXPORT_MAX_AGE
+            for export_file in EXPORT_DIR.iterdir():
+                if export_file.stat().st_mtime < export_cutoff:
+                    export_file.unlink(missing_ok=True)
+        except OSError:
+            pass
+        with app.app_context():
+            try:
+                cutoff = datetime.utcnow() - timedelta(seconds=_PHOTO_GC_GRACE)
+                rows = db.session.execute(
+                    select(Photo.id, Photo.filename, Photo.pdf_thumb_filename)
+                    .where(Photo.deleted_at < cutoff)
+                ).all()
+                if not rows:
+                    continue
+
+                for _, filename, thumb_filename in rows:
+                    (UPLOAD_DIR / filename).unlink(missing_ok=True)
+                    if thumb_filename:
+                        (UPLOAD_DIR / thumb_filename).unlink(missing_ok=True)
+
+                db.session.execute(
+                    delete(Photo).where(Photo.id.in_([row[0] for row in rows]))
+                )
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+
+threading.Thread(target=_photo_gc_loop, daemon=True).start()
+
 # Fehlerbehandlung
 @app.errorhandler(404)
 def not_found(error):
@@ -710,14 +1175,36 @@ def internal_error(error):
     db.session.rollback()
     return jsonify({'error': 'Interner Serverfehler'}), 500
 
-# Datenbank initialisieren
-@app.before_first_request
-def create_tables():
+# Datenbank beim Import initialisieren - @app.before_first_request wurde in
+# Flask 2.3 entfernt und hat davor jeden Request um einen Flag-Check verteuert;
+# der explizite Block hier deckt auch WSGI-Deployments ab
+with app.app_context():
     db.create_all()
+    # create_all legt nur fehlende Tabellen an - später ergänzte Spalten und
+    # Indizes müssen auf bestehenden Datenbanken per ALTER TABLE nachgezogen
+    # werden, sonst schlagen Queries mit "no such column" fehl
+    with db.engine.begin() as connection:
+        existing_columns = {row[1] for row in connection.exec_driver_sql('PRAGMA table_info(photo)')}
+        for column, ddl in (
+            ('pdf_thumb_filename', 'pdf_thumb_filename VARCHAR(255)'),
+            ('width', 'width INTEGER'),
+            ('height', 'height INTEGER'),
+            ('deleted_at', 'deleted_at DATETIME'),
+        ):
+            if column not in existing_columns:
+                connection.exec_driver_sql(f'ALTER TABLE photo ADD COLUMN {ddl}')
+        connection.exec_driver_sql('CREATE INDEX IF NOT EXISTS ix_entry_project_date ON entry (project_id, "date")')
+        connection.exec_driver_sql('CREATE INDEX IF NOT EXISTS ix_photo_project_taken ON photo (project_id, date_taken)')
+        connection.exec_driver_sql('CREATE INDEX IF NOT EXISTS ix_photo_deleted_at ON photo (deleted_at)')
+    # Im In-Memory-Modus existiert noch kein Projekt - direkt anlegen
+    if 'memory' in app.config['SQLALCHEMY_DATABASE_URI']:
+        get_or_create_project()
 
 if __name__ == '__main__':
     # Datenbank erstellen falls nicht vorhanden
     with app.app_context():
         db.create_all()
-    
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+
+    # Nur der single-threaded Entwicklungsserver - im Produktivbetrieb
+    # stattdessen: gunicorn -c gunicorn.conf.py app:app
+    app.run(debug=os.environ.get('FLASK_ENV', 'dev') == 'dev', host='0.0.0.0', port=5000)
\ No newline at end of file
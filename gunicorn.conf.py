@@ -0,0 +1,11 @@
+# gunicorn.conf.py - Produktivserver für das Bautagebuch
+# Start: gunicorn -c gunicorn.conf.py app:app
+import multiprocessing
+
+bind = '0.0.0.0:5000'
+workers = multiprocessing.cpu_count() * 2 + 1
+threads = 4
+worker_class = 'gthread'
+# App vor dem Fork einmal laden - Code und DB-Engine werden dann
+# per Copy-on-Write zwischen den Workern geteilt
+preload_app = True